@@ -1,21 +1,62 @@
 import pandas as pd
-import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import cast
 
+# pyarrow's multithreaded CSV reader is optional; fall back to pandas' C parser
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    _CSV_ENGINE = "c"
+
 # Get the directory where this script is located
-DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+# CSV paths resolved once at import
+_PATHS = {
+    filename: DATA_DIR / filename
+    for filename in (
+        "aic_per_capita.csv",
+        "housing_cost_overburden.csv",
+        "real_minimum_wage.csv",
+        "household_saving_rate.csv",
+        "gini_index.csv",
+        "employment_ratio.csv",
+    )
+}
+
+@functools.lru_cache(maxsize=None)
+def _read_series(filename: str) -> pd.Series:
+    """Read and parse one CSV. Failures raise, so lru_cache never keeps them."""
+    filepath = _PATHS.get(filename, DATA_DIR / filename)
+    data = pd.read_csv(
+        filepath,
+        index_col='TIME_PERIOD',
+        dtype={'TIME_PERIOD': str},
+        engine=_CSV_ENGINE
+    )
+    periods = data.index.astype(str)
+    if periods.str.contains('-Q').any():
+        # Quarterly periods (2019-Q1) map to the first day of the quarter
+        data.index = pd.PeriodIndex(periods, freq='Q').to_timestamp()
+    else:
+        data.index = pd.to_datetime(periods, format="ISO8601", cache=True)
+    series = cast(pd.Series, data['OBS_VALUE'])
+    if series.empty:
+        raise ValueError("no observations")
+    return series
 
 def load_csv_data(filename: str, name: str) -> pd.Series:
-    """Generic function to load and parse data from a local CSV file."""
+    """Generic function to load and parse data from a local CSV file.
+
+    Parsed files are cached; callers must not mutate the returned Series.
+    """
     try:
-        filepath = os.path.join(DATA_DIR, filename)
-        data = pd.read_csv(
-            filepath,
-            index_col='TIME_PERIOD',
-            parse_dates=True
-        )
+        series = _read_series(filename)
         print(f"Successfully loaded {name} from {filename}")
-        return cast(pd.Series, data['OBS_VALUE'])
+        return series
     except Exception as e:
         print(f"Could not load {name} from {filename}. Error: {e}")
         return pd.Series(dtype='float64')
@@ -41,20 +82,18 @@ def fetch_employment_ratio() -> pd.Series:
 
 if __name__ == '__main__':
     print("--- Loading All Halom Oracle Data from Local CSVs ---")
-    aic = fetch_aic_per_capita()
-    print("AIC:\n", aic.tail(), "\n")
-    
-    housing_cost = fetch_housing_cost_overburden()
-    print("Housing Cost Overburden:\n", housing_cost.tail(), "\n")
-
-    min_wage = fetch_real_minimum_wage()
-    print("Real Minimum Wage:\n", min_wage.tail(), "\n")
-
-    savings = fetch_household_saving_rate()
-    print("Household Savings Rate:\n", savings.tail(), "\n")
-
-    gini = fetch_gini_index()
-    print("Gini Index:\n", gini.tail(), "\n")
-    
-    employment = fetch_employment_ratio()
-    print("Employment Ratio:\n", employment.tail(), "\n") 
\ No newline at end of file
+    loaders = [
+        ("AIC", fetch_aic_per_capita),
+        ("Housing Cost Overburden", fetch_housing_cost_overburden),
+        ("Real Minimum Wage", fetch_real_minimum_wage),
+        ("Household Savings Rate", fetch_household_saving_rate),
+        ("Gini Index", fetch_gini_index),
+        ("Employment Ratio", fetch_employment_ratio),
+    ]
+
+    # The files are independent and read_csv releases the GIL while parsing
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        results = list(executor.map(lambda loader: loader[1](), loaders))
+
+    for (label, _), series in zip(loaders, results):
+        print(f"{label}:\n", series.tail(), "\n")
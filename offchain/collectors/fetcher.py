@@ -1,41 +1,84 @@
 import requests
 import os
 import time
+import gzip
 import hashlib
-import json
+import orjson
+from typing import Any, Tuple
+from cachetools import TLRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 CACHE_DIR = os.path.expanduser('~/.halom/cache')
+CACHE_TTL = 86400
+
+def _entry_expiry(_url: str, entry: Tuple[Any, float], _now: float) -> float:
+    return entry[1]
+
+# In-process tier in front of the disk cache: url -> (data, expiry epoch seconds).
+# Entries expire with the cache file they came from, not CACHE_TTL after loading.
+_MEM: TLRUCache = TLRUCache(maxsize=512, ttu=_entry_expiry, timer=time.time)
+
+# The cache directory only needs creating once per process
+_CACHE_READY = False
+
+# Shared keep-alive session so repeated fetches reuse TCP/TLS connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
 def fetch_json(url: str):
     """
-    Fetches JSON data from a URL, using a local cache to avoid repeated requests.
-    The cache expires after 24 hours (86400 seconds).
+    Fetches JSON data from a URL, using an in-memory and a local disk cache to
+    avoid repeated requests. Data expires 24 hours (86400 seconds) after it was
+    fetched from the network.
     """
-    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Check the in-process cache first
+    entry = _MEM.get(url)
+    if entry is not None:
+        return entry[0]
+    
+    global _CACHE_READY
+    if not _CACHE_READY:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _CACHE_READY = True
     
     # Create a hash of the URL to use as a filename
-    h = hashlib.sha256(url.encode()).hexdigest()
-    f = os.path.join(CACHE_DIR, f'{h}.json')
+    h = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    f = os.path.join(CACHE_DIR, f'{h}.json.gz')
     
-    # Check if a valid cache file exists
-    if os.path.exists(f) and time.time() - os.path.getmtime(f) < 86400:
+    # Check if a valid cache file exists, with a single stat call
+    try:
+        expires_at = os.stat(f).st_mtime + CACHE_TTL
+    except FileNotFoundError:
+        expires_at = 0.0
+    
+    if time.time() < expires_at:
         print(f"Loading from cache: {url}")
-        with open(f, 'r') as file:
-            return json.load(file)
+        with open(f, 'rb') as file:
+            data = orjson.loads(gzip.decompress(file.read()))
+        _MEM[url] = (data, expires_at)
+        return data
             
     # If no valid cache, fetch from network
     print(f"Fetching from network: {url}")
     try:
-        response = requests.get(url, timeout=30)
+        response = _SESSION.get(url, timeout=(5, 30))
         response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Save to cache
-        with open(f, 'w') as file:
-            json.dump(data, file)
-            
+        # Save the raw body to cache compressed, no need to re-serialize
+        with open(f, 'wb') as file:
+            file.write(gzip.compress(response.content, compresslevel=5))
+        
+        _MEM[url] = (data, time.time() + CACHE_TTL)
         return data
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching {url}: {e}")
         return None
 
@@ -0,0 +1,19 @@
+"""
+Ahead-of-time build of the HOI kernel into a native extension.
+
+Run once per deploy: python -m offchain.processing._hoi_aot
+"""
+
+import os
+
+from numba.pycc.cc import CC
+
+from .hoi_engine import _hoi_kernel_py, _hoi_scalar_py
+
+cc = CC('hoi_native')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export('calculate_hoi_f64', 'f8(f8[:])')(_hoi_kernel_py)
+cc.export('calculate_hoi_scalar_f64', 'f8(' + ', '.join(['f8'] * 12) + ')')(_hoi_scalar_py)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -5,43 +5,177 @@ Enhanced Halom Oracle Updater with scheduling, logging, and monitoring
 
 import os
 import time
-import json
+import asyncio
+import queue
+import random
+import atexit
+import functools
 import logging
-import smtplib
-import schedule
-from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+import logging.handlers
+import sqlite3
+import threading
+import statistics
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple, cast
 from dotenv import load_dotenv
-from web3 import Web3
+from web3 import AsyncWeb3, PersistentConnectionProvider
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError, TransactionNotFound
+from web3.utils import get_abi_output_types
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Try to import geth_poa_middleware, fallback if not available
+# Try to import the async-capable POA middleware, fallback if not available
 try:
-    from web3.middleware.geth_poa import geth_poa_middleware  # type: ignore
+    from web3.middleware import ExtraDataToPOAMiddleware as poa_middleware  # type: ignore
 except ImportError:
-    geth_poa_middleware = None
+    try:
+        from web3.middleware.geth_poa import async_geth_poa_middleware as poa_middleware  # type: ignore
+    except ImportError:
+        poa_middleware = None
+
+# ijson is optional; it lets the ABI be read without parsing the whole artifact
+try:
+    import ijson  # type: ignore
+except ImportError:
+    ijson = None
+
+# smtplib and email.mime are only needed once an email alert is sent
+if TYPE_CHECKING:
+    import smtplib
 
-from .hoi_engine import calculate_hoi, assemble_data_for_hoi
+from .hoi_engine import calculate_hoi, assemble_data_for_hoi, HOI_INPUT_ORDER
+from .failover_provider import FailoverAsyncHTTPProvider
+from .orjson_rpc import OrjsonAsyncHTTPProvider, OrjsonAsyncIPCProvider, OrjsonWebSocketProvider
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging: records are queued and written by a background listener
+# so file and console I/O never run on the update loop
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_file_handler = logging.handlers.RotatingFileHandler('oracle_updater.log', maxBytes=10_000_000, backupCount=5, delay=True)
+_file_handler.setFormatter(_log_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('oracle_updater.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
+_log_listener = logging.handlers.QueueListener(_log_queue, _file_handler, _stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+UPDATE_INTERVAL_SECONDS = int(os.getenv("UPDATE_INTERVAL_SECONDS", "3600"))
+STATE_DB_PATH = os.getenv("UPDATER_STATE_DB", "updater_state.db")
+
+# Indicator API retries: transient statuses and connection errors back off with jitter
+API_RETRY_ATTEMPTS = 3
+API_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+API_MAX_BACKOFF_SECONDS = 30.0
+
+# Rebroadcasts of the same signed transaction after a transport error
+SEND_RETRY_ATTEMPTS = 3
+
+DEPLOYMENT_PATH = os.path.join(os.path.dirname(__file__), 'deployment.json')
+ORACLE_ABI_PATH = os.path.join(os.path.dirname(__file__), '../artifacts/contracts/HalomOracleV2.sol/HalomOracleV2.json')
+
+# Role IDs are keccak256 constants in HalomOracleV2; derive them instead of reading them
+ORACLE_UPDATER_ROLE = AsyncWeb3.keccak(text="ORACLE_UPDATER_ROLE")
+
+# Multicall3 is deployed at the same address on most chains; set empty to disable
+MULTICALL3_ADDRESS = os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+_MULTICALL3_ABI = [{
+    'name': 'aggregate3',
+    'type': 'function',
+    'stateMutability': 'payable',
+    'inputs': [{
+        'name': 'calls',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'target', 'type': 'address'},
+            {'name': 'allowFailure', 'type': 'bool'},
+            {'name': 'callData', 'type': 'bytes'}
+        ]
+    }],
+    'outputs': [{
+        'name': 'returnData',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'success', 'type': 'bool'},
+            {'name': 'returnData', 'type': 'bytes'}
+        ]
+    }]
+}]
+
+def _load_deployment(path: str = DEPLOYMENT_PATH) -> Dict[str, Any]:
+    """Load the deployment addresses, reparsing only when the file changes"""
+    return _parse_deployment(path, os.stat(path).st_mtime_ns)
+
+def _load_oracle_abi(path: str = ORACLE_ABI_PATH):
+    """Load the oracle ABI, reparsing only when the artifact changes"""
+    return _parse_oracle_abi(path, os.stat(path).st_mtime_ns)
+
+# The mtime argument is only part of the cache key, so a redeploy invalidates the entry
+@functools.lru_cache(maxsize=4)
+def _parse_deployment(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse deployment.json"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+@functools.lru_cache(maxsize=4)
+def _parse_oracle_abi(path: str, mtime_ns: int):
+    """Parse the oracle ABI, preferring an ABI-only sidecar of the artifact"""
+    sidecar_path = os.path.splitext(path)[0] + '.abi.json'
+    try:
+        if os.stat(sidecar_path).st_mtime >= os.stat(path).st_mtime:
+            with open(sidecar_path, 'rb') as f:
+                return orjson.loads(f.read())
+    except FileNotFoundError:
+        pass
+    
+    # The full artifact also carries bytecode and source maps; keep only the ABI.
+    # Hardhat writes "abi" before "bytecode", so streaming stops before the bulk.
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            abi = next(ijson.items(f, 'abi', use_float=True))
+        else:
+            abi = orjson.loads(f.read())['abi']
+    
+    try:
+        # Write atomically so a partial sidecar is never picked up
+        tmp_path = sidecar_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(abi))
+        os.replace(tmp_path, sidecar_path)
+    except OSError as e:
+        logger.warning("Could not write ABI sidecar %s: %s", sidecar_path, e)
+    
+    return abi
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Honour a numeric Retry-After, otherwise exponential backoff with full jitter"""
+    if retry_after is not None and retry_after.isdigit():
+        return min(float(retry_after), API_MAX_BACKOFF_SECONDS)
+    return random.uniform(0, min(0.5 * 2 ** attempt, API_MAX_BACKOFF_SECONDS))
+
 class OracleUpdater:
     def __init__(self):
         self.rpc_url = os.getenv("RPC_URL", "http://localhost:8545")
+        self.ws_rpc_url = os.getenv("WS_RPC_URL")
+        # Receipt polling interval without a WebSocket; roughly one block instead of web3's 0.1s
+        self.receipt_poll_seconds = float(os.getenv("RECEIPT_POLL_SECONDS", "2"))
+        # Blocks a submission must be buried under before it counts (0 = first receipt)
+        self.finality_depth = int(os.getenv("FINALITY_DEPTH", "0"))
+        # Optional comma-separated RPC pool; requests go to the fastest healthy endpoint
+        self.rpc_urls = [url.strip() for url in os.getenv("RPC_URLS", "").split(",") if url.strip()]
         self.private_key = os.getenv("PRIVATE_KEY")
         self.chain_id = int(os.getenv("CHAIN_ID", "31337"))
         
@@ -52,61 +186,199 @@ class OracleUpdater:
         self.smtp_password = os.getenv("SMTP_PASSWORD")
         self.notification_email = os.getenv("NOTIFICATION_EMAIL")
         
+        # Slack alerts in flight, kept referenced until they complete
+        self._alert_tasks: set = set()
+        
+        # Long-lived SMTP connection, only touched by the email worker thread
+        self._smtp: Optional["smtplib.SMTP"] = None
+        self._email_queue: "queue.Queue[str]" = queue.Queue()
+        self._email_worker: Optional[threading.Thread] = None
+        atexit.register(self._close_smtp)
+        
         # Slack webhook (optional)
         self.slack_webhook = os.getenv("SLACK_WEBHOOK")
         
         # API endpoints for real-time data
         self.eurostat_api = os.getenv("EUROSTAT_API_URL", "https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0/data/")
         self.oecd_api = os.getenv("OECD_API_URL", "https://stats.oecd.org/restsdmx/sdmx.ashx/GetData/")
+        # Example: employment ratio from Eurostat, other indicators from OECD
+        self.employment_url = f"{self.eurostat_api}LFST_R_LFUR4GPH"
+        self.gini_url = f"{self.oecd_api}EQ_DI/.../OECD"
+        
+        # Pooled keep-alive session shared by Eurostat, OECD and Slack calls
+        self.http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        )
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+        
+        # Last HOI inputs and result; upstream data changes monthly at best
+        self._hoi_memo: Optional[Tuple[tuple, float]] = None
+        
+        # Async session for the indicator APIs, created lazily inside the event loop
+        self._api_session: Optional[aiohttp.ClientSession] = None
+        
+        # Macro indicators change quarterly at best, so cache fetched data
+        self.cache_ttl_seconds = int(os.getenv("CACHE_TTL_SECONDS", "21600"))
+        # (data, epoch seconds fetched); wall clock so it can be persisted across restarts
+        self._real_time_cache: Optional[Tuple[Dict[str, Any], float]] = None
+        # (url, prefix) -> (ETag, decoded result) for conditional requests; the result
+        # depends on the prefix, so a 304 must only return what was decoded with it
+        self._etags: Dict[Tuple[str, Optional[str]], Tuple[str, Any]] = {}
+        
+        # Skip submissions that don't move HOI enough, unless the heartbeat is due
+        self.hoi_deviation_bps = int(os.getenv("HOI_DEVIATION_BPS", "25"))
+        self.heartbeat_seconds = int(os.getenv("HOI_HEARTBEAT_SECONDS", "86400"))
+        self.last_submitted_hoi: Optional[int] = None
+        
+        # Circuit breaker: after repeated failures only health checks run, with one
+        # trial submission per cooldown until a submission succeeds again
+        self.breaker_threshold = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+        self.breaker_cooldown_seconds = int(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "21600"))
+        self._last_failure_time: Optional[float] = None
+        
+        # The updater is the only signer for its account, so track the nonce locally
+        self._nonce: Optional[int] = None
+        self._nonce_lock = asyncio.Lock()
+        
+        # Single-flight guard so overlapping triggers share one update
+        self._in_flight: Optional[asyncio.Task] = None
+        self._update_lock = asyncio.Lock()
+        
+        # submitHOI(uint256) has a fixed selector and fixed-size calldata, so the
+        # selector is precomputed
+        self._submit_selector = AsyncWeb3.keccak(text="submitHOI(uint256)")[:4]
+        # (oracle round nonce, access list); the slots submitHOI touches move every round
+        self._submit_access_list: Optional[Tuple[int, list]] = None
         
         # Oracle configuration
         self.oracle_address: Optional[str] = None
         self.updater_address: Optional[str] = None
         self.oracle_contract: Optional[Any] = None
-        self.w3: Optional[Web3] = None
+        self._multicall: Optional[Any] = None
+        self.w3: Optional[AsyncWeb3] = None
         self.updater_account: Optional[Any] = None
         
         # Statistics
         self.successful_updates = 0
         self.failed_updates = 0
-        self.last_update_time: Optional[datetime] = None
+        # Epoch seconds rather than datetime; it's only ever compared and persisted
+        self.last_update_time: Optional[float] = None
         self.consecutive_failures = 0
         
+        # Persist statistics across restarts so alert thresholds and the
+        # deviation/heartbeat check survive a redeploy
+        self._db = sqlite3.connect(STATE_DB_PATH, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+        self._load_state()
+        
         self._initialize_web3()
         self._load_deployment_info()
 
+    def _load_state(self):
+        """Restore statistics and the API response cache saved by a previous run"""
+        row = self._db.execute("SELECT value FROM state WHERE key = 'updater'").fetchone()
+        if row is None:
+            return
+        
+        state = orjson.loads(row[0])
+        self.successful_updates = state.get('successful_updates', 0)
+        self.failed_updates = state.get('failed_updates', 0)
+        self.consecutive_failures = state.get('consecutive_failures', 0)
+        self.last_submitted_hoi = state.get('last_submitted_hoi')
+        self.last_update_time = state.get('last_update_time')
+        
+        logger.info("Restored updater state: %s", state)
+        
+        row = self._db.execute("SELECT value FROM state WHERE key = 'api_cache'").fetchone()
+        if row is not None:
+            api_cache = orjson.loads(row[0])
+            if api_cache.get('real_time') is not None:
+                self._real_time_cache = tuple(api_cache['real_time'])
+            self._etags = {(url, prefix): (etag, result) for url, prefix, etag, result in api_cache.get('etags', [])}
+
+    def _save_state(self):
+        """Write current statistics and the API response cache"""
+        state = {
+            'successful_updates': self.successful_updates,
+            'failed_updates': self.failed_updates,
+            'consecutive_failures': self.consecutive_failures,
+            'last_submitted_hoi': self.last_submitted_hoi,
+            'last_update_time': self.last_update_time
+        }
+        api_cache = {
+            'real_time': self._real_time_cache,
+            'etags': [[url, prefix, etag, result] for (url, prefix), (etag, result) in self._etags.items()]
+        }
+        self._db.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            [('updater', orjson.dumps(state).decode()), ('api_cache', orjson.dumps(api_cache).decode())]
+        )
+
     def _initialize_web3(self):
-        """Initialize Web3 connection"""
+        """Initialize async Web3 connection"""
         try:
-            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-            
-            # Only inject geth_poa_middleware if it's available
-            if geth_poa_middleware is not None:
-                self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            self.w3 = AsyncWeb3(self._create_provider())
             
-            if not self.w3.is_connected():
-                raise Exception(f"Could not connect to RPC URL: {self.rpc_url}")
-            
-            logger.info(f"Connected to blockchain at {self.rpc_url}")
+            # Only inject the POA middleware if it's available
+            if poa_middleware is not None:
+                self.w3.middleware_onion.inject(poa_middleware, layer=0)
             
         except Exception as e:
-            logger.error(f"Failed to initialize Web3: {e}")
+            logger.error("Failed to initialize Web3: %s", e)
             raise
 
+    def _create_provider(self):
+        """Pick a provider for the configured endpoint(s)"""
+        request_kwargs = {'timeout': aiohttp.ClientTimeout(total=30)}
+        if len(self.rpc_urls) > 1:
+            return FailoverAsyncHTTPProvider(
+                self.rpc_urls, provider_class=OrjsonAsyncHTTPProvider, request_kwargs=request_kwargs
+            )
+        
+        rpc_url = self.rpc_urls[0] if self.rpc_urls else self.rpc_url
+        
+        # Local nodes are much faster over a persistent WebSocket or IPC connection
+        if rpc_url.startswith(('ws://', 'wss://')):
+            return OrjsonWebSocketProvider(rpc_url)
+        if rpc_url.endswith('.ipc'):
+            return OrjsonAsyncIPCProvider(rpc_url)
+        return OrjsonAsyncHTTPProvider(rpc_url, request_kwargs=request_kwargs)
+
+    async def _check_connection(self):
+        """Verify the RPC endpoint is reachable"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        
+        if isinstance(self.w3.provider, PersistentConnectionProvider):
+            await self.w3.provider.connect()
+        
+        endpoints = ", ".join(self.rpc_urls) if self.rpc_urls else self.rpc_url
+        if not await self.w3.is_connected():
+            raise Exception(f"Could not connect to RPC URL: {endpoints}")
+        
+        logger.info("Connected to blockchain at %s", endpoints)
+        
+        # Chains without Multicall3 (e.g. a local node) use JSON-RPC batching instead
+        if self._multicall is not None and not await self.w3.eth.get_code(self._multicall.address):
+            logger.warning("No Multicall3 contract at %s, using JSON-RPC batching", self._multicall.address)
+            self._multicall = None
+
     def _load_deployment_info(self):
         """Load contract deployment information"""
         try:
-            deployment_path = os.path.join(os.path.dirname(__file__), 'deployment.json')
-            with open(deployment_path, 'r') as f:
-                addresses = json.load(f)
+            addresses = _load_deployment()
             
             self.oracle_address = addresses['halomOracle']
             self.updater_address = addresses['roles']['updater']
             
             # Load contract ABI
-            oracle_abi_path = os.path.join(os.path.dirname(__file__), '../artifacts/contracts/HalomOracleV2.sol/HalomOracleV2.json')
-            with open(oracle_abi_path, 'r') as f:
-                oracle_data = json.load(f)
+            oracle_abi = _load_oracle_abi()
             
             if self.w3 is None:
                 raise Exception("Web3 not initialized")
@@ -117,7 +389,7 @@ class OracleUpdater:
             checksum_oracle_address = self.w3.to_checksum_address(self.oracle_address)
             self.oracle_contract = self.w3.eth.contract(
                 address=checksum_oracle_address, 
-                abi=oracle_data['abi']
+                abi=oracle_abi
             )
             
             # Initialize account
@@ -127,40 +399,65 @@ class OracleUpdater:
             if self.w3 is None:
                 raise Exception("Web3 not initialized")
             
-            self.updater_account = self.w3.eth.account.from_key(self.private_key)
+            account = self.w3.eth.account.from_key(self.private_key)
+            self.updater_account = account
             
             if (self.updater_account is not None and self.updater_address is not None and 
                 self.updater_account.address.lower() != self.updater_address.lower()):
-                logger.warning(f"Private key address ({self.updater_account.address}) doesn't match updater address ({self.updater_address})")
+                logger.warning("Private key address (%s) doesn't match updater address (%s)", self.updater_account.address, self.updater_address)
+            
+            # Fields that are identical for every submitHOI transaction
+            self._tx_template = {
+                'to': checksum_oracle_address,
+                'from': self.w3.to_checksum_address(account.address),
+                'chainId': self.chain_id,
+                'type': 2
+            }
             
-            logger.info(f"Oracle contract loaded at {self.oracle_address}")
+            # Bind the per-cycle read calls once; only .call() runs on the hot path
+            self._call_nonce = self.oracle_contract.functions.nonce()
+            self._call_paused = self.oracle_contract.functions.paused()
+            self._call_current_round = self.oracle_contract.functions.getCurrentRound()
+            self._call_is_authorized = self.oracle_contract.functions.authorizedOracles(account.address)
+            self._call_has_updater_role = self.oracle_contract.functions.hasRole(
+                ORACLE_UPDATER_ROLE, account.address
+            )
+            self._call_own_submission = self.oracle_contract.functions.getOracleSubmission(account.address)
+            
+            if MULTICALL3_ADDRESS:
+                self._multicall = self.w3.eth.contract(
+                    address=self.w3.to_checksum_address(MULTICALL3_ADDRESS),
+                    abi=_MULTICALL3_ABI
+                )
+            
+            logger.info("Oracle contract loaded at %s", self.oracle_address)
             if self.updater_account is not None:
-                logger.info(f"Using updater account: {self.updater_account.address}")
+                logger.info("Using updater account: %s", self.updater_account.address)
             
         except Exception as e:
-            logger.error(f"Failed to load deployment info: {e}")
+            logger.error("Failed to load deployment info: %s", e)
             raise
 
-    def fetch_real_time_data(self):
+    async def fetch_real_time_data(self):
         """Fetch real-time data from APIs instead of static CSV files"""
+        if self._real_time_cache is not None:
+            cached_data, fetched_at = self._real_time_cache
+            if time.time() - fetched_at < self.cache_ttl_seconds:
+                logger.info("Using cached real-time data")
+                return cached_data
+        
         try:
             logger.info("Fetching real-time economic data...")
             
-            # Example: Fetch employment ratio from Eurostat
-            employment_url = f"{self.eurostat_api}LFST_R_LFUR4GPH"
-            response = requests.get(employment_url, timeout=30)
-            response.raise_for_status()
+            # The two requests are independent, so issue them concurrently.
+            # From the Eurostat JSON-stat document only the `value` map is needed.
+            data, gini_data = await asyncio.gather(
+                self._fetch_json(self.employment_url, prefix='value'),
+                self._fetch_json(self.gini_url)
+            )
             
-            # Parse Eurostat response (simplified)
-            data = response.json()
+            # Parse responses (simplified)
             employment_ratio = self._extract_employment_ratio(data)
-            
-            # Fetch other indicators from OECD
-            gini_url = f"{self.oecd_api}EQ_DI/.../OECD"
-            response = requests.get(gini_url, timeout=30)
-            response.raise_for_status()
-            
-            gini_data = response.json()
             gini_index = self._extract_gini_index(gini_data)
             
             # Combine with other indicators
@@ -170,17 +467,70 @@ class OracleUpdater:
                 'timestamp': datetime.now().isoformat()
             }
             
-            logger.info(f"Real-time data fetched: {real_time_data}")
+            logger.info("Real-time data fetched: %s", real_time_data)
+            self._real_time_cache = (real_time_data, time.time())
             return real_time_data
             
         except Exception as e:
-            logger.error(f"Failed to fetch real-time data: {e}")
+            logger.error("Failed to fetch real-time data: %s", e)
             # Fallback to static data
             logger.info("Falling back to static CSV data")
-            return assemble_data_for_hoi()
+            return await asyncio.to_thread(assemble_data_for_hoi)
+
+    def _get_api_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use"""
+        if self._api_session is None or self._api_session.closed:
+            self._api_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, limit_per_host=8, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30, sock_connect=5),
+                headers={'Accept-Encoding': 'gzip, deflate'}
+            )
+        return self._api_session
+
+    async def _fetch_json(self, url: str, prefix: Optional[str] = None):
+        """GET a URL and decode its JSON body, or only the member at `prefix`"""
+        for attempt in range(API_RETRY_ATTEMPTS):
+            last_attempt = attempt == API_RETRY_ATTEMPTS - 1
+            cached = self._etags.get((url, prefix))
+            headers = {'If-None-Match': cached[0]} if cached is not None else None
+            try:
+                async with self._get_api_session().get(url, headers=headers) as response:
+                    if response.status == 304 and cached is not None:
+                        return cached[1]
+                    
+                    if response.status in API_RETRY_STATUSES and not last_attempt:
+                        delay = _retry_delay(response.headers.get('Retry-After'), attempt)
+                        logger.warning("%s returned %d, retrying in %.1fs", url, response.status, delay)
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    response.raise_for_status()
+                    if prefix is not None and ijson is not None:
+                        # Stream the body and stop once the member is parsed; the rest of
+                        # the document (dimension labels etc.) is never decoded
+                        async for item in ijson.items_async(response.content, prefix, use_float=True):
+                            return self._remember_etag(url, prefix, response, item)
+                        raise ValueError(f"No '{prefix}' member in response from {url}")
+                    
+                    data = orjson.loads(await response.read())
+                    return self._remember_etag(url, prefix, response, data if prefix is None else data[prefix])
+            
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                delay = _retry_delay(None, attempt)
+                logger.warning("%s failed (%s), retrying in %.1fs", url, e, delay)
+                await asyncio.sleep(delay)
+
+    def _remember_etag(self, url: str, prefix: Optional[str], response: aiohttp.ClientResponse, result: Any) -> Any:
+        """Keep the decoded result under the response's ETag so an unchanged resource is a 304"""
+        etag = response.headers.get('ETag')
+        if etag is not None:
+            self._etags[(url, prefix)] = (etag, result)
+        return result
 
     def _extract_employment_ratio(self, data):
-        """Extract employment ratio from Eurostat response"""
+        """Extract employment ratio from the Eurostat response's `value` map"""
         # Simplified extraction - in production, parse the actual Eurostat format
         try:
             # This is a placeholder - actual implementation would parse Eurostat JSON
@@ -197,19 +547,19 @@ class OracleUpdater:
         except:
             return 30.2
 
-    def calculate_and_submit_hoi(self):
+    async def calculate_and_submit_hoi(self):
         """Calculate HOI and submit to oracle"""
         try:
             logger.info("Starting HOI calculation and submission...")
             
             # Fetch data (real-time or fallback)
-            data = self.fetch_real_time_data()
+            data = await self.fetch_real_time_data()
             
             # Calculate HOI
-            hoi_float = calculate_hoi(data)
+            hoi_float = self._calculate_hoi_cached(data)
             hoi_value = int(hoi_float * 1e9)
             
-            logger.info(f"Calculated HOI: {hoi_float:.4f} ({hoi_value})")
+            logger.info("Calculated HOI: %.4f (%d)", hoi_float, hoi_value)
             
             if self.oracle_contract is None:
                 raise Exception("Oracle contract not initialized")
@@ -220,63 +570,375 @@ class OracleUpdater:
             if self.updater_account is None:
                 raise Exception("Updater account not initialized")
             
-            # Get current nonce
-            current_nonce = self.oracle_contract.functions.nonce().call()
-            logger.info(f"Current oracle nonce: {current_nonce}")
-            
-            # Build and send transaction
-            tx = self.oracle_contract.functions.submitHOI(hoi_value).build_transaction({
-                'from': self.updater_account.address,
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.updater_account.address),
-                'chainId': self.chain_id
-            })
+            # Fetch oracle nonce, the round, our submission for it and fee history in one JSON-RPC batch
+            async with self.w3.batch_requests() as batch:
+                batch.add(self._call_nonce)
+                batch.add(self._call_current_round)
+                batch.add(self._call_own_submission)
+                batch.add(self.w3.eth.fee_history(20, 'latest', [50]))
+                current_nonce, round_info, own_submission, fee_history = cast(List[Any], await batch.async_execute())
+            
+            logger.debug("Current oracle nonce: %s", current_nonce)
             
-            # Sign and send transaction
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # The contract accepts one submission per oracle per round; a second would revert
+            if own_submission[2]:
+                logger.info("skip-already-submitted: round %s already has our HOI %s", current_nonce, own_submission[0])
+                return
+            
+            # Once peers have opened the round it needs our submission to reach consensus
+            # before the window closes, so only skip a round nobody has started
+            round_open = round_info[3] > 0 and not round_info[4]
+            if not round_open and self._below_deviation_threshold(hoi_value):
+                logger.info("skip-no-deviation: HOI %d within %d bps of %s", hoi_value, self.hoi_deviation_bps, self.last_submitted_hoi)
+                return
+            
+            # Build, sign and send an EIP-1559 transaction
+            tx_hash = await self._send_with_managed_nonce(
+                await self._build_submit_tx(hoi_value, self._eip1559_fees(fee_history), current_nonce)
+            )
             
             # Wait for transaction receipt
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            try:
+                receipt = await self._wait_for_receipt(tx_hash)
+                if receipt['status'] == 1 and self.finality_depth > 0:
+                    receipt = await self._wait_for_finality(tx_hash, receipt)
+            except Exception:
+                # Dropped or still pending: the local nonce may be past one the node never mined
+                await self._reset_nonce()
+                raise
+            
+            if receipt is None:
+                # The nonce it used may be free again; resync before the next send
+                await self._reset_nonce()
+                raise Exception(f"HOI submission {tx_hash.hex()} was dropped by a reorg")
             
             if receipt['status'] == 1:
-                logger.info(f"HOI submission successful: {tx_hash.hex()}")
+                logger.info("HOI submission successful: %s", tx_hash.hex())
                 self.successful_updates += 1
                 self.consecutive_failures = 0
-                self.last_update_time = datetime.now()
+                self.last_update_time = time.time()
+                self.last_submitted_hoi = hoi_value
                 
                 # Send success notification
                 self._send_alert(f"HOI update successful: {hoi_float:.4f}")
                 
             else:
-                logger.error(f"HOI submission failed: {tx_hash.hex()}")
+                logger.error("HOI submission failed: %s", tx_hash.hex())
+                # Recompute the cached access list on the next attempt
+                self._submit_access_list = None
                 self.failed_updates += 1
                 self.consecutive_failures += 1
+                self._last_failure_time = time.time()
                 
                 # Send failure notification
                 self._send_alert(f"HOI update failed: {tx_hash.hex()}")
                 
         except Exception as e:
-            logger.error(f"Failed to calculate and submit HOI: {e}")
+            logger.error("Failed to calculate and submit HOI: %s", e)
             self.failed_updates += 1
             self.consecutive_failures += 1
+            self._last_failure_time = time.time()
             
             # Send error notification
             self._send_alert(f"HOI update error: {str(e)}")
             raise
 
+    def _calculate_hoi_cached(self, data: Dict[str, Any]) -> float:
+        """Calculate HOI unless the inputs match the previous run"""
+        key = tuple(data.get(name) for name in HOI_INPUT_ORDER)
+        if self._hoi_memo is not None and self._hoi_memo[0] == key:
+            logger.info("HOI inputs unchanged, reusing previous result")
+            return self._hoi_memo[1]
+        
+        # A few microseconds of arithmetic; cheaper inline than any executor hand-off
+        hoi_float = calculate_hoi(data)
+        self._hoi_memo = (key, hoi_float)
+        return hoi_float
+
+    async def _fetch_pending_nonce(self) -> int:
+        """Read the account nonce from the node, including pending transactions"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        if self.updater_account is None:
+            raise Exception("Updater account not initialized")
+        return await self.w3.eth.get_transaction_count(self.updater_account.address, 'pending')
+
+    async def _reset_nonce(self):
+        """Forget the local nonce so the next send reads it from the node"""
+        async with self._nonce_lock:
+            self._nonce = None
+
+    async def _send_with_managed_nonce(self, tx_fields: Dict[str, Any]):
+        """Sign and send using the local nonce, resyncing once if the node rejects it"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        
+        async with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = await self._fetch_pending_nonce()
+            
+            for attempt in range(2):
+                tx = {**tx_fields, 'nonce': self._nonce}
+                signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
+                try:
+                    tx_hash = await self._broadcast(signed_tx)
+                except Exception as e:
+                    error = str(e).lower()
+                    if attempt == 0 and ("nonce too low" in error or "replacement" in error):
+                        logger.warning("Local nonce %s rejected, resyncing: %s", self._nonce, e)
+                        self._nonce = await self._fetch_pending_nonce()
+                        continue
+                    # The node may never have taken this nonce; resync before the next send
+                    self._nonce = None
+                    raise
+                
+                self._nonce += 1
+                return tx_hash
+            
+            raise Exception("Transaction rejected after nonce resync")
+
+    async def _broadcast(self, signed_tx):
+        """Send a signed transaction, rebroadcasting the same bytes after transport errors"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        
+        attempt = 0
+        while True:
+            try:
+                return await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                if attempt == SEND_RETRY_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(None, attempt)
+                logger.warning("Broadcast failed (%s), retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+            except Exception as e:
+                # An earlier attempt reached the node before its connection dropped; it may
+                # even be mined already, in which case the node reports "nonce too low"
+                if attempt > 0 and ("already known" in str(e).lower() or await self._has_transaction(signed_tx.hash)):
+                    return signed_tx.hash
+                raise
+
+    async def _has_transaction(self, tx_hash) -> bool:
+        """Check whether the node has the transaction, pending or mined"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        try:
+            await self.w3.eth.get_transaction(tx_hash)
+            return True
+        except TransactionNotFound:
+            return False
+
+    async def _build_submit_tx(self, hoi_value: int, fees: Dict[str, int], round_nonce: int) -> Dict[str, Any]:
+        """Build the submitHOI transaction without going through the ABI encoder"""
+        if self.oracle_contract is None:
+            raise Exception("Oracle contract not initialized")
+        if self.updater_account is None:
+            raise Exception("Updater account not initialized")
+        
+        tx = {
+            **self._tx_template,
+            'data': self._submit_selector + hoi_value.to_bytes(32, 'big'),
+            **fees
+        }
+        tx['accessList'] = await self._get_submit_access_list(tx, round_nonce)
+        tx['gas'] = await self._estimate_submit_gas(tx)
+        return tx
+
+    async def _get_submit_access_list(self, tx: Dict[str, Any], round_nonce: int) -> list:
+        """Compute the EIP-2930 access list for submitHOI once per oracle round so its storage reads are warm"""
+        # submissions[nonce][sender] and consensusRounds[nonce] are new slots each round
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        if self._submit_access_list is not None and self._submit_access_list[0] == round_nonce:
+            return self._submit_access_list[1]
+        
+        try:
+            result = await self.w3.eth.create_access_list(
+                {'from': tx['from'], 'to': tx['to'], 'data': tx['data']},
+                'latest'
+            )
+        except Exception as e:
+            # Not cached, so the next submission tries again
+            logger.warning("Access list creation failed, submitting without one: %s", e)
+            return []
+        
+        self._submit_access_list = (round_nonce, list(result['accessList']))
+        return self._submit_access_list[1]
+
+    async def _estimate_submit_gas(self, tx: Dict[str, Any]) -> int:
+        """Estimate gas for this submission"""
+        # Not reused: the submission that reaches the consensus threshold also runs
+        # the rebase and costs far more than an ordinary one
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        try:
+            estimate = await self.w3.eth.estimate_gas({
+                'from': tx['from'],
+                'to': tx['to'],
+                'data': tx['data'],
+                'accessList': tx['accessList']
+            })
+            return estimate * 12 // 10  # 20% headroom
+        except Exception as e:
+            logger.warning("Gas estimation failed, using default limit: %s", e)
+            return 200000
+
+    def _eip1559_fees(self, fee_history) -> Dict[str, int]:
+        """Derive type-2 fee fields from eth_feeHistory"""
+        # The last baseFeePerGas entry is the base fee of the next block
+        base_fee = fee_history['baseFeePerGas'][-1]
+        # Nodes without recent transactions (e.g. a fresh devnet) return no rewards; use the 1 gwei floor alone
+        rewards = [reward[0] for reward in fee_history.get('reward') or [] if reward]
+        tip = max(int(statistics.median(rewards)), 1_000_000_000) if rewards else 1_000_000_000
+        return {
+            'maxFeePerGas': 2 * base_fee + tip,
+            'maxPriorityFeePerGas': tip
+        }
+
+    async def _wait_for_receipt(self, tx_hash, timeout: float = 300):
+        """Wait for a receipt, checking once per new block when a WebSocket RPC is configured"""
+        if self.ws_rpc_url:
+            try:
+                return await asyncio.wait_for(self._wait_for_receipt_ws(tx_hash), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                logger.warning("WebSocket receipt wait failed, falling back to polling: %s", e)
+        
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        return await self.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=timeout, poll_latency=self.receipt_poll_seconds
+        )
+
+    async def _wait_for_receipt_ws(self, tx_hash):
+        """Subscribe to newHeads and fetch the receipt once per block"""
+        async with AsyncWeb3(OrjsonWebSocketProvider(self.ws_rpc_url)) as ws_w3:
+            await ws_w3.eth.subscribe('newHeads')
+            
+            # The transaction may have been mined before the subscription started
+            try:
+                return await ws_w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                pass
+            
+            async for _ in ws_w3.socket.process_subscriptions():
+                try:
+                    return await ws_w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    continue
+            
+            raise Exception("newHeads subscription ended before the receipt arrived")
+
+    async def _wait_for_finality(self, tx_hash, receipt, timeout: float = 900):
+        """Wait until the receipt is finality_depth blocks deep; None if a reorg dropped the transaction"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        w3 = self.w3
+        
+        async def wait():
+            nonlocal receipt
+            while True:
+                if await w3.eth.block_number < receipt['blockNumber'] + self.finality_depth:
+                    await asyncio.sleep(self.receipt_poll_seconds)
+                    continue
+                
+                try:
+                    current = await w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    return None
+                if current['blockHash'] == receipt['blockHash']:
+                    return current
+                
+                # Re-included in a different block after a reorg; wait for that one instead
+                logger.warning("HOI submission %s moved to block %s after a reorg", tx_hash.hex(), current['blockNumber'])
+                receipt = current
+        
+        try:
+            return await asyncio.wait_for(wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Still mined, just not deep enough yet; failing here would resubmit a landed HOI
+            logger.warning("HOI submission %s not %d blocks deep after %.0fs; counting it as mined in block %s",
+                           tx_hash.hex(), self.finality_depth, timeout, receipt['blockNumber'])
+            return receipt
+
+    def _circuit_open(self) -> bool:
+        """Check whether submissions are suspended after repeated failures"""
+        if self.consecutive_failures < self.breaker_threshold or self._last_failure_time is None:
+            return False
+        return time.time() - self._last_failure_time < self.breaker_cooldown_seconds
+
+    def _below_deviation_threshold(self, hoi_value: int) -> bool:
+        """Check whether hoi_value is too close to the last submission to be worth sending"""
+        if self.last_submitted_hoi is None or self.last_update_time is None:
+            return False
+        
+        if time.time() - self.last_update_time >= self.heartbeat_seconds:
+            return False
+        
+        delta_bps = abs(hoi_value - self.last_submitted_hoi) * 10_000 // max(self.last_submitted_hoi, 1)
+        return delta_bps < self.hoi_deviation_bps
+
     def _log_statistics(self):
         """Log current statistics"""
-        logger.info(f"Statistics - Successful: {self.successful_updates}, Failed: {self.failed_updates}, Consecutive failures: {self.consecutive_failures}")
+        logger.info("Statistics - Successful: %d, Failed: %d, Consecutive failures: %d",
+                    self.successful_updates, self.failed_updates, self.consecutive_failures)
 
     def _send_alert(self, message):
-        """Send alert via email and/or Slack"""
+        """Send alert via email and/or Slack in the background"""
         if self.notification_email:
-            self._send_email_alert(message)
+            self._enqueue_email_alert(message)
         
         if self.slack_webhook:
-            self._send_slack_alert(message)
+            task = asyncio.create_task(asyncio.to_thread(self._send_slack_alert, message))
+            self._alert_tasks.add(task)
+            task.add_done_callback(self._alert_tasks.discard)
+
+    def _enqueue_email_alert(self, message):
+        """Hand an email alert to the background worker"""
+        if self._email_worker is None or not self._email_worker.is_alive():
+            self._email_worker = threading.Thread(target=self._email_worker_loop, name="email-alerts", daemon=True)
+            self._email_worker.start()
+        self._email_queue.put(message)
+
+    def _email_worker_loop(self):
+        """Drain queued email alerts so the update loop never blocks on SMTP"""
+        while True:
+            message = self._email_queue.get()
+            try:
+                self._send_email_alert(message)
+            finally:
+                self._email_queue.task_done()
+
+    def _get_smtp(self) -> "smtplib.SMTP":
+        """Return the cached SMTP connection, reconnecting if it went away"""
+        import smtplib
+        
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._smtp = None
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=15)
+        server.starttls()
+        if self.smtp_username is not None and self.smtp_password is not None:
+            server.login(self.smtp_username, self.smtp_password)
+        self._smtp = server
+        return server
+
+    def _close_smtp(self):
+        """Close the cached SMTP connection"""
+        if self._smtp is not None:
+            import smtplib
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
 
     def _send_email_alert(self, message):
         """Send email alert"""
@@ -285,6 +947,9 @@ class OracleUpdater:
                 logger.warning("Email notification not configured")
                 return
             
+            from email.mime.text import MIMEText
+            from email.mime.multipart import MIMEMultipart
+            
             msg = MIMEMultipart()
             if self.smtp_username is not None:
                 msg['From'] = self.smtp_username
@@ -306,17 +971,14 @@ class OracleUpdater:
             
             msg.attach(MIMEText(body, 'plain'))
             
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            if self.smtp_username is not None and self.smtp_password is not None:
-                server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
+            self._get_smtp().send_message(msg)
             
             logger.info("Email alert sent successfully")
             
         except Exception as e:
-            logger.error(f"Failed to send email alert: {e}")
+            logger.error("Failed to send email alert: %s", e)
+            # Force a fresh connection on the next alert
+            self._smtp = None
 
     def _send_slack_alert(self, message):
         """Send Slack alert"""
@@ -349,15 +1011,20 @@ class OracleUpdater:
                 ]
             }
             
-            response = requests.post(self.slack_webhook, json=payload, timeout=10)
+            response = self.http.post(
+                self.slack_webhook,
+                data=orjson.dumps(payload),
+                headers={'Content-Type': 'application/json'},
+                timeout=(5, 10)
+            )
             response.raise_for_status()
             
             logger.info("Slack alert sent successfully")
             
         except Exception as e:
-            logger.error(f"Failed to send Slack alert: {e}")
+            logger.error("Failed to send Slack alert: %s", e)
 
-    def health_check(self):
+    async def health_check(self):
         """Perform health check on oracle contract"""
         try:
             if self.oracle_contract is None:
@@ -372,65 +1039,158 @@ class OracleUpdater:
                 logger.error("Updater account not initialized")
                 return False
             
+            # Read paused flag, current round and authorization in one round-trip
+            is_paused, round_info, is_authorized, has_updater_role = await self._read_calls(
+                self._call_paused, self._call_current_round,
+                self._call_is_authorized, self._call_has_updater_role
+            )
+            
             # Check if oracle is paused
-            is_paused = self.oracle_contract.functions.paused().call()
             if is_paused:
                 logger.warning("Oracle is paused")
                 return False
             
             # Check current round
-            round_info = self.oracle_contract.functions.getCurrentRound().call()
-            logger.info(f"Current round: {round_info}")
+            logger.debug("Current round: %s", round_info)
             
             # Check if updater is authorized
-            is_authorized = self.oracle_contract.functions.authorizedOracles(self.updater_account.address).call()
             if not is_authorized:
                 logger.error("Updater not authorized")
                 return False
             
+            # submitHOI is also gated on the role, not just the oracle allowlist
+            if not has_updater_role:
+                logger.error("Updater lacks ORACLE_UPDATER_ROLE")
+                return False
+            
             logger.info("Health check passed")
             return True
             
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             return False
 
-    def run_scheduled_update(self):
+    async def _read_calls(self, *calls) -> list:
+        """Run view calls as a single Multicall3 eth_call, or one JSON-RPC batch without it"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        
+        if self._multicall is not None:
+            try:
+                return await self._multicall_read(calls)
+            except (ContractLogicError, BadFunctionCallOutput) as e:
+                # Multicall3 reverted or isn't deployed here; don't retry it
+                logger.warning("Multicall3 unusable, using JSON-RPC batching: %s", e)
+                self._multicall = None
+            except Exception as e:
+                # Transport errors are transient; keep Multicall3 for the next read
+                logger.warning("Multicall3 read failed, using JSON-RPC batching for this read: %s", e)
+        
+        async with self.w3.batch_requests() as batch:
+            for call in calls:
+                batch.add(call)
+            return await batch.async_execute()
+
+    async def _multicall_read(self, calls) -> list:
+        """Aggregate view calls through Multicall3.aggregate3 and decode each result"""
+        if self.w3 is None:
+            raise Exception("Web3 not initialized")
+        if self.oracle_contract is None or self._multicall is None:
+            raise Exception("Oracle contract or Multicall3 not initialized")
+        
+        aggregate_calls = [
+            (call.address, False, self.oracle_contract.encode_abi(call.fn_name, args=call.args))
+            for call in calls
+        ]
+        results = await self._multicall.functions.aggregate3(aggregate_calls).call()
+        
+        decoded = []
+        for call, (_, return_data) in zip(calls, results):
+            values = self.w3.codec.decode(get_abi_output_types(call.abi), return_data)
+            decoded.append(values[0] if len(values) == 1 else list(values))
+        return decoded
+
+    async def run_scheduled_update(self):
+        """Run scheduled update, joining the in-flight run instead of starting a second one"""
+        async with self._update_lock:
+            if self._in_flight is None or self._in_flight.done():
+                self._in_flight = asyncio.create_task(self._do_update())
+            in_flight = self._in_flight
+        return await in_flight
+
+    async def _do_update(self):
         """Run scheduled update with error handling"""
         try:
             logger.info("Running scheduled update...")
             
-            if not self.health_check():
+            if not await self.health_check():
                 logger.error("Health check failed, skipping update")
                 return
             
-            self.calculate_and_submit_hoi()
+            if self._circuit_open():
+                logger.warning("circuit-open: %d consecutive failures, next submission attempt after cooldown",
+                               self.consecutive_failures)
+                return
+            
+            await self.calculate_and_submit_hoi()
             self._log_statistics()
             
         except Exception as e:
-            logger.error(f"Scheduled update failed: {e}")
+            logger.error("Scheduled update failed: %s", e)
             self._send_alert(f"Scheduled update failed: {str(e)}")
+        
+        finally:
+            await asyncio.to_thread(self._save_state)
 
-def main():
-    """Main function to run the oracle updater"""
+    async def close(self):
+        """Flush pending alerts, then release pooled HTTP connections and the state DB"""
+        if self._alert_tasks:
+            await asyncio.gather(*self._alert_tasks, return_exceptions=True)
+        if self._api_session is not None and not self._api_session.closed:
+            await self._api_session.close()
+        self.http.close()
+        if self.w3 is not None:
+            await self.w3.provider.disconnect()
+        self._db.close()
+
+async def main_async():
+    """Run the initial update, then one update at each interval boundary of the wall clock"""
+    updater = OracleUpdater()
+    tick: Optional[asyncio.Task] = None
     try:
-        updater = OracleUpdater()
-        
-        # Schedule updates every hour
-        schedule.every().hour.do(updater.run_scheduled_update)
-        
-        # Run initial update
-        updater.run_scheduled_update()
+        await updater._check_connection()
         
-        # Keep running scheduled updates
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            if tick is not None and not tick.done():
+                # An overrunning update absorbs this tick instead of queueing a second run
+                logger.warning("Previous update still running at tick, not starting another")
+            else:
+                # Run in the background so a slow submission can't push back the next tick
+                tick = asyncio.create_task(updater.run_scheduled_update())
+            
+            # Sleep to the next boundary (e.g. top of the hour); recomputed each time, so no drift
+            await asyncio.sleep(UPDATE_INTERVAL_SECONDS - time.time() % UPDATE_INTERVAL_SECONDS)
+    finally:
+        if tick is not None and not tick.done():
+            tick.cancel()
+            await asyncio.gather(tick, return_exceptions=True)
+        await updater.close()
+
+def main():
+    """Main function to run the oracle updater"""
+    # The log format never uses process/thread fields; skip collecting them per record.
+    # These are process-wide, so only the standalone updater sets them, not importers.
+    logging.logProcesses = False
+    logging.logThreads = False
+    logging.logMultiprocessing = False
+    
+    try:
+        asyncio.run(main_async())
             
     except KeyboardInterrupt:
         logger.info("Oracle updater stopped by user")
     except Exception as e:
-        logger.error(f"Oracle updater failed: {e}")
+        logger.error("Oracle updater failed: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+Multi-endpoint async RPC provider with latency-ranked routing and failover
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, List, Type
+
+import aiohttp
+from web3 import AsyncHTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+logger = logging.getLogger(__name__)
+
+
+class FailoverAsyncHTTPProvider(AsyncJSONBaseProvider):
+    """
+    Routes each JSON-RPC request to the fastest healthy endpoint.
+
+    Every endpoint keeps its own AsyncHTTPProvider (and therefore its own warm
+    aiohttp connection pool). Latency is tracked as an EWMA per endpoint; an
+    endpoint that times out or returns an HTTP error is marked degraded for
+    `degraded_seconds` and only retried once the healthy ones are exhausted.
+    """
+
+    def __init__(self, endpoint_uris: List[str], degraded_seconds: float = 30.0,
+                 ewma_alpha: float = 0.3, provider_class: Type[AsyncHTTPProvider] = AsyncHTTPProvider,
+                 **kwargs: Any):
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+
+        super().__init__()
+        self.endpoint_uris = list(endpoint_uris)
+        self.degraded_seconds = degraded_seconds
+        self.ewma_alpha = ewma_alpha
+
+        # Failover is the retry layer; AsyncHTTPProvider's own retries would hit a
+        # failing endpoint five times before the next one is tried
+        self._providers = [
+            provider_class(uri, exception_retry_configuration=None, **kwargs)
+            for uri in self.endpoint_uris
+        ]
+        self._latency = [0.0] * len(self._providers)
+        self._degraded_until = [0.0] * len(self._providers)
+
+    def _ranked_endpoints(self) -> List[int]:
+        """Healthy endpoints by latency, then degraded ones by soonest recovery"""
+        now = time.monotonic()
+        indices = range(len(self._providers))
+        healthy = sorted((i for i in indices if self._degraded_until[i] <= now), key=lambda i: self._latency[i])
+        degraded = sorted((i for i in indices if self._degraded_until[i] > now), key=lambda i: self._degraded_until[i])
+        return healthy + degraded
+
+    def _record_latency(self, index: int, elapsed: float):
+        """Fold a successful request's latency into the endpoint's EWMA"""
+        if self._latency[index] == 0.0:
+            self._latency[index] = elapsed
+        else:
+            self._latency[index] += self.ewma_alpha * (elapsed - self._latency[index])
+        self._degraded_until[index] = 0.0
+
+    def _mark_degraded(self, index: int, error: Exception):
+        """Take an endpoint out of rotation for a while"""
+        self._degraded_until[index] = time.monotonic() + self.degraded_seconds
+        logger.warning("RPC endpoint %s degraded: %s", self.endpoint_uris[index], error)
+
+    async def _route(self, call):
+        """Try endpoints in rank order until one answers"""
+        last_error: Exception = Exception("No RPC endpoint available")
+        for index in self._ranked_endpoints():
+            start = time.monotonic()
+            try:
+                response = await call(self._providers[index])
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._mark_degraded(index, e)
+                last_error = e
+                continue
+            self._record_latency(index, time.monotonic() - start)
+            return response
+        raise last_error
+
+    async def make_request(self, method, params):
+        return await self._route(lambda provider: provider.make_request(method, params))
+
+    async def make_batch_request(self, batch_requests):
+        return await self._route(lambda provider: provider.make_batch_request(batch_requests))
+
+    async def disconnect(self):
+        for provider in self._providers:
+            await provider.disconnect()
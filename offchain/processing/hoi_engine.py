@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import cast
+from concurrent.futures import ProcessPoolExecutor
+from typing import cast, Any, Iterable, List, Optional
+from cachetools.func import ttl_cache
+
+# Numba is optional; without it the kernel runs as plain Python
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    njit = None
 from ..collectors.data_collector import (
     fetch_aic_per_capita,
     fetch_housing_cost_overburden,
@@ -18,21 +27,28 @@ def get_values_for_year(series: pd.Series, year: int):
 
     datetime_index = cast(pd.DatetimeIndex, series.index)
 
-    # Filter using the .year attribute, which is more robust for this case
-    data_for_year = cast(pd.Series, series[datetime_index.to_series().dt.year == year])
-    if not data_for_year.empty:
-        return data_for_year.iloc[-1] # Return the last value for that year
+    # Match on the index's integer years directly; no intermediate Series or mask indexing.
+    # The stubs leave DatetimeIndex.year untyped, hence the cast.
+    positions = np.flatnonzero(np.asarray(cast(Any, datetime_index).year) == year)
+    if positions.size:
+        return series.iat[positions[-1]] # Return the last value for that year
     
     # Fallback: if no data for the specific year, return the last known value
     if not series.empty:
         last_date = cast(pd.Timestamp, datetime_index[-1])
         print(f"Warning: No data for year {year} in series. Falling back to latest available: {last_date.year}")
-        return series.iloc[-1]
+        return series.iat[-1]
     return None
 
 
+@ttl_cache(maxsize=1, ttl=3600)
 def assemble_data_for_hoi():
-    """Fetches all data and assembles it into a dictionary for HOI calculation."""
+    """
+    Fetches all data and assembles it into a dictionary for HOI calculation.
+
+    The result is shared by every caller within an hour (clear it with
+    assemble_data_for_hoi.cache_clear()); treat it as read-only.
+    """
     
     aic = fetch_aic_per_capita()
     housing = fetch_housing_cost_overburden()
@@ -75,6 +91,62 @@ def assemble_data_for_hoi():
     return data
 
 
+# Fixed ordering of the HOI inputs in the array passed to the kernel
+HOI_INPUT_ORDER = (
+    'AIC_t', 'AIC_2020',
+    'MinWage_t', 'MinWage_2020',
+    'Emp_t', 'Emp_2020',
+    'Hous_t', 'Hous_2020',
+    'Save_t', 'Save_2020',
+    'Gini_t', 'Gini_2020',
+)
+
+
+def _hoi_scalar_py(AIC_t: float, AIC_2020: float, MinWage_t: float, MinWage_2020: float,
+                   Emp_t: float, Emp_2020: float, Hous_t: float, Hous_2020: float,
+                   Save_t: float, Save_2020: float, Gini_t: float, Gini_2020: float) -> float:
+    """HOI arithmetic on the twelve inputs, taken as float64 scalars in HOI_INPUT_ORDER."""
+    # Gini may arrive as a percentage or a fraction; scale by 100 or 1 without branching
+    Gini_t = Gini_t / (1.0 + 99.0 * (Gini_t > 1))
+    Gini_2020 = Gini_2020 / (1.0 + 99.0 * (Gini_2020 > 1))
+
+    # 3.1 HOI Normalization (2020 = 1)
+    A_t = AIC_t / AIC_2020
+    M_t = MinWage_t / MinWage_2020
+    E_t = Emp_t / Emp_2020
+    H_t = Hous_t / Hous_2020
+    S_t = Save_t / Save_2020
+    G_t = (1 - Gini_t) / (1 - Gini_2020)
+    
+    # 3.2 Sub-indices and Aggregation
+    Y_t = (M_t**0.4) * (E_t**0.3) * (S_t**0.3)
+    C_t = (A_t**0.7) * (H_t**0.3)
+    Q_t = G_t
+    HOI_t = (Y_t**0.50) * (C_t**-0.35) * (Q_t**0.15)
+    
+    return HOI_t
+
+
+# The array kernel calls this one, never whichever scalar was picked below, so
+# _hoi_aot.py still compiles once hoi_native exists
+_hoi_scalar_jit = njit(cache=True)(_hoi_scalar_py) if njit is not None else _hoi_scalar_py
+
+
+def _hoi_kernel_py(x: np.ndarray) -> float:
+    """HOI arithmetic over a float64 array laid out as HOI_INPUT_ORDER."""
+    return _hoi_scalar_jit(x[0], x[1], x[2], x[3], x[4], x[5], x[6], x[7], x[8], x[9], x[10], x[11])
+
+
+# Prefer the ahead-of-time build (see _hoi_aot.py) so a restart doesn't pay
+# the JIT compile on its first update; otherwise JIT, otherwise plain Python.
+# The scalar kernel serves single calls without allocating an input array.
+try:
+    from .hoi_native import calculate_hoi_f64 as _hoi_kernel, calculate_hoi_scalar_f64 as _hoi_scalar  # type: ignore
+except ImportError:
+    _hoi_scalar = _hoi_scalar_jit
+    _hoi_kernel = njit(cache=True)(_hoi_kernel_py) if njit is not None else _hoi_kernel_py
+
+
 def calculate_hoi(data: dict):
     """
     Calculates the Halom Oracle Index (HOI) based on input data.
@@ -87,25 +159,55 @@ def calculate_hoi(data: dict):
     - Save_t, Save_2020 (Household saving rate)
     - Gini_t, Gini_2020 (Gini index)
     """
-    
-    Gini_t = data['Gini_t'] / 100 if data['Gini_t'] > 1 else data['Gini_t']
-    Gini_2020 = data['Gini_2020'] / 100 if data['Gini_2020'] > 1 else data['Gini_2020']
+    # float() pins one compiled signature regardless of int/numpy input types
+    return float(_hoi_scalar(*[float(data[key]) for key in HOI_INPUT_ORDER]))
 
-    # 3.1 HOI Normalization (2020 = 1)
-    A_t = data['AIC_t'] / data['AIC_2020']
-    M_t = data['MinWage_t'] / data['MinWage_2020']
-    E_t = data['Emp_t'] / data['Emp_2020']
-    H_t = data['Hous_t'] / data['Hous_2020']
-    S_t = data['Save_t'] / data['Save_2020']
-    G_t = (1 - Gini_t) / (1 - Gini_2020)
-    
-    # 3.2 Sub-indices and Aggregation
-    Y_t = (M_t**0.4) * (E_t**0.3) * (S_t**0.3)
-    C_t = (A_t**0.7) * (H_t**0.3)
-    Q_t = G_t
-    HOI_t = (Y_t**0.50) * (C_t**-0.35) * (Q_t**0.15)
-    
-    return HOI_t
+
+def normalize_gini(gini):
+    """Gini as a 0-1 fraction, accepting percentages; works elementwise on arrays."""
+    gini = np.asarray(gini, dtype=np.float64)
+    return np.where(gini > 1, gini / 100, gini)
+
+
+# Cobb-Douglas exponents of the normalized ratios [M, E, S, A, H, G]:
+# Y^0.50 * C^-0.35 * Q^0.15 expanded, so log HOI is a single dot product
+_HOI_WEIGHTS = np.array([0.50 * 0.4, 0.50 * 0.3, 0.50 * 0.3, -0.35 * 0.7, -0.35 * 0.3, 0.15])
+
+
+def calculate_hoi_vec(M, E, S, A, H, G) -> np.ndarray:
+    """
+    Calculates HOI for arrays of normalized ratios (2020 = 1), e.g. a whole time series.
+
+    M, E, S, A, H are the t/2020 ratios of minimum wage, employment, saving rate,
+    consumption and housing cost; G is (1 - Gini_t) / (1 - Gini_2020) with both
+    Gini values as fractions (see normalize_gini). Inputs broadcast against each
+    other. Results agree with calculate_hoi to rounding; the on-chain submission
+    keeps using calculate_hoi.
+    """
+    ratios = np.stack(np.broadcast_arrays(M, E, S, A, H, G), axis=-1).astype(np.float64, copy=False)
+    return np.exp(np.log(ratios) @ _HOI_WEIGHTS)
+
+
+def _hoi_row(values: np.ndarray) -> float:
+    """Pool worker entry point: HOI for one packed input row."""
+    return float(_hoi_kernel(values))
+
+
+def calculate_hoi_batch(data_list: Iterable[dict], max_workers: Optional[int] = None,
+                        chunksize: int = 32) -> List[float]:
+    """
+    Calculates HOI for many input dictionaries (backtests, multiple regions).
+
+    Inputs are packed into one float64 matrix up front; batches larger than
+    a couple of chunks are spread over a process pool, smaller ones run inline
+    since process start-up would cost more than the work.
+    """
+    rows = np.asarray([[data[key] for key in HOI_INPUT_ORDER] for data in data_list], dtype=np.float64)
+    if len(rows) <= 2 * chunksize:
+        return [_hoi_row(row) for row in rows]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_hoi_row, rows, chunksize=chunksize))
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,57 @@
+"""
+orjson-backed JSON-RPC encoding for the web3 async providers
+"""
+
+from typing import Any
+
+import orjson
+from hexbytes import HexBytes
+from web3 import AsyncHTTPProvider, AsyncIPCProvider, WebSocketProvider
+from web3.datastructures import AttributeDict
+from web3.exceptions import ProviderConnectionError
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the web3 types orjson doesn't know, as Web3JsonEncoder does"""
+    if isinstance(obj, AttributeDict):
+        return obj.__dict__
+    if isinstance(obj, (HexBytes, bytes)):
+        return HexBytes(obj).to_0x_hex()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonRPCMixin:
+    """
+    Replaces web3's stdlib-json request encoding and response decoding with orjson.
+
+    Ethereum JSON-RPC encodes quantities as hex strings, so orjson's 64-bit
+    integer limit doesn't apply to responses. Bodies orjson rejects go through
+    web3's own decoder so its error reporting is unchanged.
+    """
+
+    @staticmethod
+    def encode_rpc_dict(rpc_dict) -> bytes:
+        return orjson.dumps(rpc_dict, default=_default)
+
+    @staticmethod
+    def decode_rpc_response(raw_response):
+        try:
+            return orjson.loads(raw_response)
+        except orjson.JSONDecodeError:
+            return AsyncHTTPProvider.decode_rpc_response(raw_response)
+
+
+class OrjsonAsyncHTTPProvider(OrjsonRPCMixin, AsyncHTTPProvider):
+    pass
+
+
+class OrjsonWebSocketProvider(OrjsonRPCMixin, WebSocketProvider):
+    async def socket_recv(self):
+        # WebSocketProvider decodes frames with json.loads directly, not via decode_rpc_response
+        if self._ws is None:
+            raise ProviderConnectionError("Connection to websocket has not been initiated for the provider.")
+        return self.decode_rpc_response(await self._ws.recv())
+
+
+class OrjsonAsyncIPCProvider(OrjsonRPCMixin, AsyncIPCProvider):
+    pass
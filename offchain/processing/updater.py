@@ -1,6 +1,7 @@
 import os
 import time
-import json
+import functools
+import orjson
 from dotenv import load_dotenv
 from web3 import Web3
 # Try to import geth_poa_middleware, fallback if not available
@@ -15,9 +16,13 @@ from .hoi_engine import calculate_hoi, assemble_data_for_hoi
 load_dotenv()
 
 def get_contract_abi(file_path):
-    """Loads a contract ABI from its JSON artifact."""
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    """Loads a contract ABI from its JSON artifact, reparsing only when the artifact changes."""
+    return _parse_contract_abi(file_path, os.stat(file_path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=4)
+def _parse_contract_abi(file_path, mtime_ns):
+    with open(file_path, 'rb') as f:
+        data = orjson.loads(f.read())
     return data['abi']
 
 def main():
@@ -27,8 +32,8 @@ def main():
 
     deployment_path = os.path.join(os.path.dirname(__file__), 'deployment.json')
     try:
-        with open(deployment_path, 'r') as f:
-            addresses = json.load(f)
+        with open(deployment_path, 'rb') as f:
+            addresses = orjson.loads(f.read())
         ORACLE_ADDRESS = addresses['halomOracle']
         UPDATER_ADDRESS = addresses['roles']['updater']
     except (FileNotFoundError, KeyError) as e:
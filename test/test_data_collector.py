@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from offchain.collectors import data_collector
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_collector, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(data_collector, "_PATHS", {})
+    data_collector._read_series.cache_clear()
+    yield tmp_path
+    data_collector._read_series.cache_clear()
+
+
+def test_quarterly_periods_parse_to_quarter_start(data_dir):
+    (data_dir / "saving.csv").write_text("TIME_PERIOD,OBS_VALUE\n2019-Q4,6.0\n2020-Q1,7.5\n2020-Q4,9.1\n")
+    series = data_collector.load_csv_data("saving.csv", "Saving")
+    assert list(series.index) == [pd.Timestamp('2019-10-01'), pd.Timestamp('2020-01-01'), pd.Timestamp('2020-10-01')]
+    assert series.iloc[-1] == 9.1
+
+
+def test_annual_and_daily_periods_parse(data_dir):
+    (data_dir / "annual.csv").write_text("TIME_PERIOD,OBS_VALUE\n2019,1.0\n2020,2.0\n")
+    (data_dir / "daily.csv").write_text("TIME_PERIOD,OBS_VALUE\n2020-01-01,3.0\n")
+    assert list(data_collector.load_csv_data("annual.csv", "Annual").index) == [pd.Timestamp('2019'), pd.Timestamp('2020')]
+    assert data_collector.load_csv_data("daily.csv", "Daily").index[0] == pd.Timestamp('2020-01-01')
+
+
+def test_failed_load_is_not_cached(data_dir):
+    assert data_collector.load_csv_data("late.csv", "Late").empty
+
+    (data_dir / "late.csv").write_text("TIME_PERIOD,OBS_VALUE\n2020,1.0\n")
+    assert data_collector.load_csv_data("late.csv", "Late").iloc[0] == 1.0
+
+
+def test_empty_load_is_not_cached(data_dir):
+    path = data_dir / "empty.csv"
+    path.write_text("TIME_PERIOD,OBS_VALUE\n")
+    assert data_collector.load_csv_data("empty.csv", "Empty").empty
+
+    path.write_text("TIME_PERIOD,OBS_VALUE\n2020,1.0\n")
+    assert not data_collector.load_csv_data("empty.csv", "Empty").empty
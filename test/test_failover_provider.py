@@ -0,0 +1,118 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from offchain.processing import failover_provider
+from offchain.processing.failover_provider import FailoverAsyncHTTPProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeEndpoint:
+    """Per-endpoint provider whose latency and failures the test controls"""
+
+    def __init__(self, uri, clock, **kwargs):
+        self.uri = uri
+        self.clock = clock
+        self.kwargs = kwargs
+        self.latency = 0.1
+        self.error = None
+        self.calls = []
+
+    async def _answer(self, kind):
+        self.calls.append(kind)
+        self.clock.now += self.latency
+        if self.error is not None:
+            raise self.error
+        return {'jsonrpc': '2.0', 'id': 0, 'result': self.uri}
+
+    async def make_request(self, method, params):
+        return await self._answer(method)
+
+    async def make_batch_request(self, batch_requests):
+        return [await self._answer('batch')]
+
+    async def disconnect(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(failover_provider, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def provider(clock):
+    return FailoverAsyncHTTPProvider(
+        ['http://a', 'http://b'],
+        degraded_seconds=30.0,
+        provider_class=lambda uri, **kwargs: FakeEndpoint(uri, clock, **kwargs)
+    )
+
+
+def _served_by(provider, count=1):
+    async def run():
+        return [(await provider.make_request('eth_blockNumber', []))['result'] for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_inner_providers_do_not_retry():
+    provider = FailoverAsyncHTTPProvider(['http://a', 'http://b'])
+    assert [p.exception_retry_configuration for p in provider._providers] == [None, None]
+
+
+def test_requests_go_to_the_fastest_endpoint(provider):
+    a, b = provider._providers
+    a.latency, b.latency = 0.5, 0.1
+
+    # Each endpoint is tried once, then the faster one keeps the traffic
+    assert _served_by(provider, 4) == ['http://a', 'http://b', 'http://b', 'http://b']
+
+
+def test_failed_endpoint_is_degraded_and_skipped(provider):
+    a, b = provider._providers
+    a.error = aiohttp.ClientConnectionError("connection refused")
+
+    assert _served_by(provider, 2) == ['http://b', 'http://b']
+    assert len(a.calls) == 1
+
+
+def test_degraded_endpoint_recovers_after_degraded_seconds(provider, clock):
+    a, b = provider._providers
+    a.error = asyncio.TimeoutError()
+    assert _served_by(provider) == ['http://b']
+
+    a.error = None
+    clock.now += 10
+    assert _served_by(provider) == ['http://b']
+    clock.now += 30
+    assert _served_by(provider) == ['http://a']
+
+
+def test_degraded_endpoints_are_still_tried_last(provider):
+    for endpoint in provider._providers:
+        endpoint.error = aiohttp.ClientConnectionError("down")
+    with pytest.raises(aiohttp.ClientConnectionError):
+        _served_by(provider)
+
+    provider._providers[1].error = None
+    assert _served_by(provider) == ['http://b']
+
+
+def test_batch_requests_fail_over(provider):
+    a, b = provider._providers
+    a.error = aiohttp.ServerDisconnectedError()
+
+    response = asyncio.run(provider.make_batch_request([('eth_blockNumber', []), ('eth_chainId', [])]))
+    assert response[0]['result'] == 'http://b'
+    assert a.calls == ['batch'] and b.calls == ['batch']
@@ -0,0 +1,56 @@
+import gzip
+import hashlib
+import os
+import time
+
+import pytest
+
+from offchain.collectors import fetcher
+
+URL = "https://example.invalid/data.json"
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetcher, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(fetcher, "_CACHE_READY", False)
+    fetcher._MEM.clear()
+    yield tmp_path
+    fetcher._MEM.clear()
+
+
+def _cache_file(cache_dir, url: str) -> str:
+    h = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f'{h}.json.gz')
+
+
+def test_non_json_body_returns_none(cache_dir, monkeypatch):
+    monkeypatch.setattr(fetcher._SESSION, "get", lambda url, timeout: FakeResponse(b"<html>502 Bad Gateway</html>"))
+    assert fetcher.fetch_json(URL) is None
+    assert URL not in fetcher._MEM
+
+
+def test_network_result_is_cached_on_disk_and_in_memory(cache_dir, monkeypatch):
+    monkeypatch.setattr(fetcher._SESSION, "get", lambda url, timeout: FakeResponse(b'{"a": 1}'))
+    assert fetcher.fetch_json(URL) == {"a": 1}
+    assert os.path.exists(_cache_file(cache_dir, URL))
+    assert fetcher._MEM[URL][1] == pytest.approx(time.time() + fetcher.CACHE_TTL, abs=5)
+
+
+def test_memory_entry_expires_with_its_cache_file(cache_dir):
+    path = _cache_file(cache_dir, URL)
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(b'{"a": 1}'))
+    mtime = time.time() - fetcher.CACHE_TTL + 60
+    os.utime(path, (mtime, mtime))
+
+    assert fetcher.fetch_json(URL) == {"a": 1}
+    assert fetcher._MEM[URL][1] == pytest.approx(mtime + fetcher.CACHE_TTL)
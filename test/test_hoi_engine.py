@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from offchain.collectors import data_collector
+from offchain.processing import hoi_engine
+
+DATA = {
+    'AIC_2020': 100, 'AIC_t': 104.2,
+    'MinWage_2020': 1500.0, 'MinWage_t': 1620.0,
+    'Hous_2020': 9.8, 'Hous_t': 8.9,
+    'Save_2020': 17.9, 'Save_t': 13.1,
+    'Gini_2020': 30.0, 'Gini_t': np.float64(29.6),
+    'Emp_2020': 72.3, 'Emp_t': 74.6,
+}
+EXPECTED_HOI = 0.974482309148144
+
+
+def test_calculate_hoi_matches_reference():
+    assert hoi_engine.calculate_hoi(DATA) == EXPECTED_HOI
+
+
+def test_kernels_agree_with_pure_python():
+    values = [float(DATA[key]) for key in hoi_engine.HOI_INPUT_ORDER]
+    assert hoi_engine._hoi_scalar_py(*values) == EXPECTED_HOI
+    assert hoi_engine._hoi_kernel(np.asarray(values)) == EXPECTED_HOI
+    assert hoi_engine.calculate_hoi_batch([DATA] * 3) == [EXPECTED_HOI] * 3
+
+
+def test_gini_accepted_as_fraction_or_percentage():
+    fractions = {**DATA, 'Gini_t': 0.296, 'Gini_2020': 0.30}
+    assert hoi_engine.calculate_hoi(fractions) == pytest.approx(EXPECTED_HOI, rel=1e-12)
+
+
+def _hoi_vec(data):
+    """calculate_hoi_vec on one input dict, normalizing the ratios by hand"""
+    gini_t, gini_2020 = hoi_engine.normalize_gini([data['Gini_t'], data['Gini_2020']])
+    return hoi_engine.calculate_hoi_vec(
+        data['MinWage_t'] / data['MinWage_2020'],
+        data['Emp_t'] / data['Emp_2020'],
+        data['Save_t'] / data['Save_2020'],
+        data['AIC_t'] / data['AIC_2020'],
+        data['Hous_t'] / data['Hous_2020'],
+        (1 - gini_t) / (1 - gini_2020),
+    )
+
+
+def test_calculate_hoi_vec_matches_calculate_hoi():
+    # DATA gives Gini as a percentage, so normalize_gini has to scale it
+    assert DATA['Gini_t'] > 1
+    assert _hoi_vec(DATA) == pytest.approx(hoi_engine.calculate_hoi(DATA), rel=1e-12)
+
+
+def test_calculate_hoi_vec_matches_calculate_hoi_on_bundled_data(monkeypatch):
+    monkeypatch.setattr(data_collector, "DATA_DIR", Path(hoi_engine.__file__).resolve().parents[1] / 'data')
+    monkeypatch.setattr(data_collector, "_PATHS", {})
+    data_collector._read_series.cache_clear()
+    hoi_engine.assemble_data_for_hoi.cache_clear()
+    try:
+        data = hoi_engine.assemble_data_for_hoi()
+    finally:
+        data_collector._read_series.cache_clear()
+        hoi_engine.assemble_data_for_hoi.cache_clear()
+    assert _hoi_vec(data) == pytest.approx(hoi_engine.calculate_hoi(data), rel=1e-12)
+
+
+def test_calculate_hoi_vec_broadcasts_over_series():
+    ratios = np.array([0.9, 1.0, 1.1])
+    expected = [hoi_engine.calculate_hoi_vec(r, 1, 1, 1, 1, 1) for r in ratios]
+    assert hoi_engine.calculate_hoi_vec(ratios, 1, 1, 1, 1, 1) == pytest.approx(expected)
+
+
+def test_array_kernel_compiles_after_scalar_is_replaced(monkeypatch):
+    # _hoi_aot.py must still build once hoi_native (a builtin scalar) is loaded
+    numba = pytest.importorskip("numba")
+    monkeypatch.setattr(hoi_engine, "_hoi_scalar", abs)
+    kernel = numba.njit(hoi_engine._hoi_kernel_py)
+    values = np.asarray([float(DATA[key]) for key in hoi_engine.HOI_INPUT_ORDER])
+    assert kernel(values) == EXPECTED_HOI
+
+
+def test_get_values_for_year_takes_last_value_of_year():
+    index = pd.DatetimeIndex(['2019-10-01', '2020-01-01', '2020-10-01', '2021-01-01'])
+    series = pd.Series([1.0, 2.0, 3.0, 4.0], index=index)
+    assert hoi_engine.get_values_for_year(series, 2020) == 3.0
+    # No observations for the year: fall back to the latest one
+    assert hoi_engine.get_values_for_year(series, 2023) == 4.0
+
+
+def test_get_values_for_year_with_tz_aware_index():
+    index = pd.DatetimeIndex(['2019-12-31 23:00', '2020-06-30', '2021-01-01'], tz='Europe/Budapest')
+    series = pd.Series([1.0, 2.0, 3.0], index=index)
+    assert hoi_engine.get_values_for_year(series, 2019) == 1.0
+    assert hoi_engine.get_values_for_year(series, 2020) == 2.0
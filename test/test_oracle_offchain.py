@@ -1 +1,448 @@
- 
\ No newline at end of file
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from hexbytes import HexBytes
+from web3.exceptions import ContractLogicError, TransactionNotFound
+
+from offchain.processing import enhanced_updater
+from offchain.processing.enhanced_updater import OracleUpdater, _retry_delay
+
+DATA = {
+    'AIC_2020': 100, 'AIC_t': 104.2,
+    'MinWage_2020': 1500.0, 'MinWage_t': 1620.0,
+    'Hous_2020': 9.8, 'Hous_t': 8.9,
+    'Save_2020': 17.9, 'Save_t': 13.1,
+    'Gini_2020': 30.0, 'Gini_t': 29.6,
+    'Emp_2020': 72.3, 'Emp_t': 74.6,
+}
+HOI_VALUE = int(0.974482309148144 * 1e9)
+TX_HASH = HexBytes(b'\x11' * 32)
+
+
+class FakeBatch:
+    """Stands in for AsyncWeb3.batch_requests(), returning canned results"""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, call):
+        pass
+
+    async def async_execute(self):
+        return self.results
+
+
+def _signed(tx, key):
+    return SimpleNamespace(raw_transaction=b'raw', hash=TX_HASH, nonce=tx['nonce'])
+
+
+class FakeChain:
+    """Stands in for w3.eth while waiting for finality: a block height and a receipt per poll"""
+
+    def __init__(self, heights, receipts):
+        self.heights = list(heights)
+        self.receipts = list(receipts)
+
+    @property
+    def block_number(self):
+        async def height():
+            return self.heights.pop(0) if len(self.heights) > 1 else self.heights[0]
+        return height()
+
+    async def get_transaction_receipt(self, tx_hash):
+        receipt = self.receipts.pop(0)
+        if isinstance(receipt, Exception):
+            raise receipt
+        return receipt
+
+
+@pytest.fixture
+def updater(tmp_path, monkeypatch):
+    monkeypatch.setattr(enhanced_updater, "STATE_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(OracleUpdater, "_initialize_web3", lambda self: None)
+    monkeypatch.setattr(OracleUpdater, "_load_deployment_info", lambda self: None)
+    monkeypatch.setattr(enhanced_updater, "_retry_delay", lambda retry_after, attempt: 0)
+
+    u = OracleUpdater()
+    u.notification_email = None
+    u.slack_webhook = None
+    u.private_key = "0x" + "01" * 32
+    u.updater_account = SimpleNamespace(address="0x" + "22" * 20)
+    u.oracle_contract = MagicMock()
+    u._tx_template = {'to': "0x" + "33" * 20, 'from': u.updater_account.address, 'chainId': 31337, 'type': 2}
+    u._call_nonce = u._call_current_round = u._call_own_submission = MagicMock()
+
+    u.w3 = MagicMock()
+    u.w3.eth.get_transaction_count = AsyncMock(return_value=5)
+    u.w3.eth.account.sign_transaction = MagicMock(side_effect=_signed)
+    u.w3.eth.send_raw_transaction = AsyncMock(return_value=TX_HASH)
+    u.w3.eth.create_access_list = AsyncMock(return_value={'accessList': [], 'gasUsed': 50000})
+    u.w3.eth.estimate_gas = AsyncMock(return_value=100000)
+    yield u
+    u._db.close()
+    u.http.close()
+
+
+def _prepare_submission(u, submission_count=0, executed=False):
+    """Canned data and pre-submit batch for calculate_and_submit_hoi"""
+    u.fetch_real_time_data = AsyncMock(return_value=DATA)
+    fee_history = {'baseFeePerGas': [10, 12], 'reward': [[2_000_000_000]]}
+    round_info = [1, 0, 0, submission_count, executed, 0]
+    u.w3.batch_requests = lambda: FakeBatch([1, round_info, [0, 0, False], fee_history])
+    u._wait_for_receipt = AsyncMock(return_value={'status': 1, 'blockNumber': 10, 'blockHash': b'h'})
+
+
+def test_failed_send_resets_local_nonce(updater):
+    updater.w3.eth.send_raw_transaction.side_effect = ValueError("insufficient funds for gas")
+
+    with pytest.raises(ValueError):
+        asyncio.run(updater._send_with_managed_nonce({'to': 'x'}))
+    assert updater._nonce is None
+
+
+def test_receipt_timeout_resets_local_nonce(updater):
+    _prepare_submission(updater)
+    updater._wait_for_receipt = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(updater.calculate_and_submit_hoi())
+    assert updater._nonce is None
+
+
+def test_nonce_too_low_resyncs_once(updater):
+    updater.w3.eth.get_transaction_count.side_effect = [5, 9]
+    updater.w3.eth.send_raw_transaction.side_effect = [ValueError("nonce too low"), TX_HASH]
+
+    assert asyncio.run(updater._send_with_managed_nonce({'to': 'x'})) == TX_HASH
+    assert [c.args[0]['nonce'] for c in updater.w3.eth.account.sign_transaction.call_args_list] == [5, 9]
+    assert updater._nonce == 10
+
+
+def test_rebroadcast_of_mined_transaction_is_not_resigned(updater):
+    # The first send reached the node and was mined before the connection dropped
+    updater.w3.eth.send_raw_transaction.side_effect = [aiohttp.ClientConnectionError(), ValueError("nonce too low")]
+    updater.w3.eth.get_transaction = AsyncMock(return_value={'hash': TX_HASH})
+
+    assert asyncio.run(updater._send_with_managed_nonce({'to': 'x'})) == TX_HASH
+    assert updater.w3.eth.account.sign_transaction.call_count == 1
+    assert updater._nonce == 6
+
+
+def test_access_list_is_cached_per_oracle_round(updater):
+    tx = {'from': 'a', 'to': 'b', 'data': b''}
+
+    async def run():
+        await updater._get_submit_access_list(tx, 1)
+        await updater._get_submit_access_list(tx, 1)
+        await updater._get_submit_access_list(tx, 2)
+
+    asyncio.run(run())
+    assert updater.w3.eth.create_access_list.await_count == 2
+
+
+def test_access_list_failure_is_not_cached(updater):
+    tx = {'from': 'a', 'to': 'b', 'data': b''}
+    slot = {'address': 'b', 'storageKeys': ['0x01']}
+    updater.w3.eth.create_access_list.side_effect = [Exception("timeout"), {'accessList': [slot]}]
+
+    async def run():
+        return await updater._get_submit_access_list(tx, 1), await updater._get_submit_access_list(tx, 1)
+
+    assert asyncio.run(run()) == ([], [slot])
+
+
+def test_gas_is_estimated_for_every_submission(updater):
+    updater.w3.eth.estimate_gas.side_effect = [100000, 500000]
+    fees = {'maxFeePerGas': 1, 'maxPriorityFeePerGas': 1}
+
+    async def run():
+        return [(await updater._build_submit_tx(HOI_VALUE, fees, 1))['gas'] for _ in range(2)]
+
+    assert asyncio.run(run()) == [120000, 600000]
+
+
+@pytest.mark.parametrize("fee_history", [
+    {'baseFeePerGas': [10, 12], 'reward': []},
+    {'baseFeePerGas': [10, 12], 'reward': [[]]},
+    {'baseFeePerGas': [10, 12]},
+])
+def test_fees_without_rewards_use_the_floor(updater, fee_history):
+    assert updater._eip1559_fees(fee_history) == {'maxFeePerGas': 24 + 10**9, 'maxPriorityFeePerGas': 10**9}
+
+
+def test_fees_use_the_median_reward(updater):
+    fee_history = {'baseFeePerGas': [10, 12], 'reward': [[2 * 10**9], [4 * 10**9], [3 * 10**9]]}
+    assert updater._eip1559_fees(fee_history) == {'maxFeePerGas': 24 + 3 * 10**9, 'maxPriorityFeePerGas': 3 * 10**9}
+
+
+def test_small_deviation_skips_an_unopened_round(updater):
+    _prepare_submission(updater, submission_count=0)
+    updater.last_submitted_hoi = HOI_VALUE
+    updater.last_update_time = time.time()
+
+    asyncio.run(updater.calculate_and_submit_hoi())
+    updater.w3.eth.send_raw_transaction.assert_not_awaited()
+
+
+def test_small_deviation_still_submits_to_an_open_round(updater):
+    _prepare_submission(updater, submission_count=1)
+    updater.last_submitted_hoi = HOI_VALUE
+    updater.last_update_time = time.time()
+
+    asyncio.run(updater.calculate_and_submit_hoi())
+    updater.w3.eth.send_raw_transaction.assert_awaited_once()
+    assert updater.successful_updates == 1
+
+
+def _receipt(block, block_hash):
+    return {'status': 1, 'blockNumber': block, 'blockHash': block_hash}
+
+
+def test_finality_returns_receipt_once_deep_enough(updater):
+    updater.finality_depth = 3
+    updater.receipt_poll_seconds = 0
+    updater.w3.eth = FakeChain([11, 12, 13], [_receipt(10, b'h')])
+
+    assert asyncio.run(updater._wait_for_finality(TX_HASH, _receipt(10, b'h'))) == _receipt(10, b'h')
+
+
+def test_finality_follows_reinclusion_after_reorg(updater):
+    updater.finality_depth = 3
+    updater.receipt_poll_seconds = 0
+    # A reorg moved the transaction from block 10 to block 11; wait for block 14 instead
+    updater.w3.eth = FakeChain([13, 13, 14], [_receipt(11, b'h2'), _receipt(11, b'h2')])
+
+    assert asyncio.run(updater._wait_for_finality(TX_HASH, _receipt(10, b'h'))) == _receipt(11, b'h2')
+    assert updater.w3.eth.receipts == []
+
+
+def test_finality_reports_transaction_dropped_by_reorg(updater):
+    updater.finality_depth = 3
+    updater.receipt_poll_seconds = 0
+    updater.w3.eth = FakeChain([13], [TransactionNotFound("gone")])
+
+    assert asyncio.run(updater._wait_for_finality(TX_HASH, _receipt(10, b'h'))) is None
+
+
+def test_finality_timeout_counts_the_mined_transaction(updater, caplog):
+    updater.finality_depth = 3
+    updater.receipt_poll_seconds = 0.01
+    updater.w3.eth = FakeChain([10], [])
+
+    assert asyncio.run(updater._wait_for_finality(TX_HASH, _receipt(10, b'h'), timeout=0.05)) == _receipt(10, b'h')
+    assert "not 3 blocks deep" in caplog.text
+
+
+def test_dropped_submission_fails_and_resets_nonce(updater):
+    _prepare_submission(updater)
+    updater.finality_depth = 3
+    updater._wait_for_finality = AsyncMock(return_value=None)
+
+    with pytest.raises(Exception, match="dropped by a reorg"):
+        asyncio.run(updater.calculate_and_submit_hoi())
+    assert updater._nonce is None
+    assert updater.successful_updates == 0 and updater.failed_updates == 1
+
+
+def _run_updates(u, count):
+    async def run():
+        for _ in range(count):
+            await u._do_update()
+    asyncio.run(run())
+
+
+def test_circuit_breaker_trips_after_threshold_failures(updater):
+    updater.breaker_threshold = 3
+    updater.health_check = AsyncMock(return_value=True)
+    updater.fetch_real_time_data = AsyncMock(side_effect=Exception("indicator API down"))
+
+    _run_updates(updater, 5)
+    assert updater.fetch_real_time_data.await_count == 3
+    assert updater.health_check.await_count == 5
+
+
+def test_circuit_breaker_retries_once_after_cooldown(updater):
+    updater.breaker_threshold = 3
+    updater.health_check = AsyncMock(return_value=True)
+    updater.fetch_real_time_data = AsyncMock(side_effect=Exception("indicator API down"))
+    _run_updates(updater, 3)
+
+    # One attempt after the cooldown; it fails, so the breaker opens for another cooldown
+    updater._last_failure_time -= updater.breaker_cooldown_seconds
+    _run_updates(updater, 2)
+    assert updater.fetch_real_time_data.await_count == 4
+
+
+def test_circuit_breaker_closes_after_a_successful_submission(updater):
+    updater.breaker_threshold = 3
+    updater.health_check = AsyncMock(return_value=True)
+    updater.fetch_real_time_data = AsyncMock(side_effect=Exception("indicator API down"))
+    _run_updates(updater, 3)
+
+    _prepare_submission(updater)
+    updater._last_failure_time -= updater.breaker_cooldown_seconds
+    _run_updates(updater, 1)
+    assert updater.consecutive_failures == 0
+    assert not updater._circuit_open()
+
+
+def test_concurrent_scheduled_updates_share_one_run(updater):
+    release = asyncio.Event()
+
+    async def slow_update():
+        await release.wait()
+
+    updater._do_update = AsyncMock(side_effect=slow_update)
+
+    async def run():
+        callers = [asyncio.create_task(updater.run_scheduled_update()) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*callers)
+        # The run has finished, so the next call starts a new one
+        await updater.run_scheduled_update()
+
+    asyncio.run(run())
+    assert updater._do_update.await_count == 2
+
+
+def test_calculate_hoi_cached_reuses_result_for_same_inputs(updater, monkeypatch):
+    first = updater._calculate_hoi_cached(DATA)
+    monkeypatch.setattr(enhanced_updater, "calculate_hoi", MagicMock(side_effect=AssertionError))
+    assert updater._calculate_hoi_cached(dict(DATA)) == first
+
+
+def test_etag_results_are_kept_per_prefix(updater):
+    document = {'value': {'0': 1.5}, 'label': 'employment'}
+
+    async def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.json_response(document, headers={'ETag': '"v1"'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/data', handler)
+        async with TestServer(app) as server:
+            url = str(server.make_url('/data'))
+            try:
+                # Each pair is a 200 followed by a 304 for the same (url, prefix)
+                return [
+                    await updater._fetch_json(url, prefix='value'),
+                    await updater._fetch_json(url),
+                    await updater._fetch_json(url, prefix='value'),
+                    await updater._fetch_json(url),
+                ]
+            finally:
+                await updater._get_api_session().close()
+
+    assert asyncio.run(run()) == [document['value'], document, document['value'], document]
+
+
+def _serve(updater, responses, served, path='/data'):
+    """Fetch path once from a test server that answers with `responses` in turn, logging statuses to `served`"""
+    async def handler(request):
+        status, headers, body = responses[min(len(served), len(responses) - 1)]
+        served.append(status)
+        return web.json_response(body, status=status, headers=headers)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get(path, handler)
+        async with TestServer(app) as server:
+            try:
+                return await updater._fetch_json(str(server.make_url(path)))
+            finally:
+                await updater._get_api_session().close()
+
+    return asyncio.run(run())
+
+
+def test_fetch_json_retries_rate_limit_then_succeeds(updater, monkeypatch):
+    delays = []
+    monkeypatch.setattr(enhanced_updater, "_retry_delay", lambda retry_after, attempt: delays.append(retry_after) or 0)
+
+    served = []
+    assert _serve(updater, [(429, {'Retry-After': '2'}, {}), (503, {}, {}), (200, {}, {'value': 1})], served) == {'value': 1}
+    assert served == [429, 503, 200]
+    assert delays == ['2', None]
+
+
+def test_fetch_json_raises_once_retries_are_exhausted(updater):
+    served = []
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        _serve(updater, [(503, {}, {})], served)
+    assert error.value.status == 503
+    assert served == [503] * enhanced_updater.API_RETRY_ATTEMPTS
+
+
+def test_fetch_json_retries_connection_errors(updater):
+    session = MagicMock()
+    session.get.side_effect = aiohttp.ClientConnectionError("connection reset")
+    updater._get_api_session = lambda: session
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(updater._fetch_json("http://indicators.invalid/data"))
+    assert session.get.call_count == enhanced_updater.API_RETRY_ATTEMPTS
+
+
+def test_retry_delay_honours_retry_after_up_to_the_cap():
+    assert _retry_delay('3', 0) == 3.0
+    assert _retry_delay('3600', 0) == enhanced_updater.API_MAX_BACKOFF_SECONDS
+
+
+def test_retry_delay_backs_off_with_jitter():
+    # A missing or HTTP-date Retry-After falls back to jittered exponential backoff
+    assert all(0 <= _retry_delay(None, 2) <= 2.0 for _ in range(50))
+    assert all(0 <= _retry_delay('Wed, 21 Oct 2026 07:28:00 GMT', 10) <= enhanced_updater.API_MAX_BACKOFF_SECONDS
+               for _ in range(50))
+
+
+def test_state_round_trip(updater):
+    updater.successful_updates = 3
+    updater.last_submitted_hoi = HOI_VALUE
+    updater.last_update_time = 1_700_000_000.5
+    updater._real_time_cache = ({'gini_index': 30.2}, 1_700_000_000.0)
+    updater._etags = {('https://a', 'value'): ('"v1"', {'0': 1.5}), ('https://a', None): ('"v2"', {'x': 1})}
+    updater._save_state()
+
+    restored = OracleUpdater()
+    try:
+        assert restored.successful_updates == 3
+        assert restored.last_submitted_hoi == HOI_VALUE
+        assert restored.last_update_time == 1_700_000_000.5
+        assert restored._real_time_cache == updater._real_time_cache
+        assert restored._etags == updater._etags
+    finally:
+        restored._db.close()
+        restored.http.close()
+
+
+def test_transient_multicall_error_keeps_multicall(updater):
+    multicall = updater._multicall = MagicMock()
+    updater._multicall_read = AsyncMock(side_effect=asyncio.TimeoutError)
+    updater.w3.batch_requests = lambda: FakeBatch([False, True])
+
+    assert asyncio.run(updater._read_calls(MagicMock(), MagicMock())) == [False, True]
+    assert updater._multicall is multicall
+
+
+def test_reverting_multicall_is_disabled(updater):
+    updater._multicall = MagicMock()
+    updater._multicall_read = AsyncMock(side_effect=ContractLogicError("execution reverted"))
+    updater.w3.batch_requests = lambda: FakeBatch([False, True])
+
+    assert asyncio.run(updater._read_calls(MagicMock(), MagicMock())) == [False, True]
+    assert updater._multicall is None
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import math
+
+import pytest
+from hexbytes import HexBytes
+from web3 import AsyncHTTPProvider, WebSocketProvider
+from web3.datastructures import AttributeDict
+
+from offchain.processing.orjson_rpc import OrjsonAsyncHTTPProvider, OrjsonWebSocketProvider
+
+
+class FakeSocket:
+    def __init__(self, frame):
+        self.frame = frame
+
+    async def recv(self):
+        return self.frame
+
+
+def test_encode_rpc_dict_writes_bytes_as_0x_hex():
+    rpc_dict = {
+        'jsonrpc': '2.0', 'id': 1, 'method': 'eth_sendRawTransaction',
+        'params': [HexBytes(b'\x01\x02'), b'\xab', AttributeDict({'data': b'\x00'})],
+    }
+    encoded = OrjsonAsyncHTTPProvider.encode_rpc_dict(rpc_dict)
+    assert json.loads(encoded)['params'] == ['0x0102', '0xab', {'data': '0x00'}]
+    assert json.loads(encoded) == json.loads(AsyncHTTPProvider.encode_rpc_dict(rpc_dict))
+
+
+def test_decode_rpc_response_parses_json():
+    raw = b'{"jsonrpc":"2.0","id":1,"result":"0x10"}'
+    assert OrjsonAsyncHTTPProvider.decode_rpc_response(raw) == {'jsonrpc': '2.0', 'id': 1, 'result': '0x10'}
+
+
+def test_decode_rpc_response_falls_back_to_web3_decoder():
+    # orjson rejects NaN; web3's stdlib-based decoder accepts it
+    raw = b'{"jsonrpc":"2.0","id":1,"result":NaN}'
+    assert math.isnan(OrjsonAsyncHTTPProvider.decode_rpc_response(raw)['result'])
+
+
+def test_decode_rpc_response_keeps_web3_errors_for_non_json():
+    with pytest.raises(ValueError) as expected:
+        AsyncHTTPProvider.decode_rpc_response(b'<html>502 Bad Gateway</html>')
+    with pytest.raises(type(expected.value)):
+        OrjsonAsyncHTTPProvider.decode_rpc_response(b'<html>502 Bad Gateway</html>')
+
+
+@pytest.mark.parametrize("frame", [
+    '{"jsonrpc":"2.0","id":7,"result":{"number":"0x1b4","hash":"0xab"}}',
+    b'{"jsonrpc":"2.0","method":"eth_subscription","params":{"subscription":"0x1","result":null}}',
+])
+def test_websocket_recv_matches_stock_provider(frame):
+    stock = WebSocketProvider("ws://localhost:8546")
+    fast = OrjsonWebSocketProvider("ws://localhost:8546")
+    stock._ws = FakeSocket(frame)
+    fast._ws = FakeSocket(frame)
+
+    assert asyncio.run(fast.socket_recv()) == asyncio.run(stock.socket_recv())